@@ -1,27 +1,97 @@
 """API routes for feedback operations."""
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime
+from functools import lru_cache
+import base64
+import binascii
+from collections import Counter
+import asyncio
 import logging
+import msgspec
 
 from ..database import get_db
+from ..models import Feedback
 from ..core.exceptions import FeedbackNotFoundError, AIServiceError
 from ..core.constants import DEFAULT_PAGE, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, MAX_FEEDBACK_FOR_SUMMARY
 from ..schemas import (
-    FeedbackCreate, FeedbackResponse, FeedbackListResponse,
-    SummarizeRequest, SummarizeResponse, StatsResponse
+    FeedbackCreate, FeedbackCreateBody, FeedbackBulkCreate, FeedbackReanalyze, FeedbackResponse, FeedbackListResponse,
+    SummarizeRequest, SummarizeResponse, StatsResponse,
+    FeedbackItem
 )
 from ..services.feedback_service import FeedbackService
 from ..services.ai_service import ai_service
+from ..services.sentiment_worker import sentiment_worker
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+def _encode_cursor(created_at: datetime, feedback_id: int) -> str:
+    """Build the opaque keyset cursor pointing just past a row."""
+    raw = f"{created_at.isoformat()}|{feedback_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Parse a cursor from _encode_cursor; raises ValueError when malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError("Malformed cursor") from e
+    created_at, _, feedback_id = raw.rpartition("|")
+    return datetime.fromisoformat(created_at), int(feedback_id)
+
+
+def _encode_page(rows, total: int, page: int, page_size: int, next_cursor: Optional[str]) -> bytes:
+    """
+    Encode a FeedbackListResponse-shaped page into a single buffer.
+    
+    Rows are converted and encoded one at a time, so only the result rows
+    and the output buffer are alive at once.
+    """
+    buf = bytearray(b'{"items":[')
+    for i, row in enumerate(rows):
+        if i:
+            buf += b","
+        item = FeedbackItem(
+            id=row.id,
+            text=row.text,
+            source=row.source,
+            created_at=row.created_at,
+            sentiment=row.sentiment,
+            metadata=row.metadata
+        )
+        _page_encoder.encode_into(item, buf, -1)
+    buf += b'],"total":%d,"page":%d,"page_size":%d,"next_cursor":' % (total, page, page_size)
+    _page_encoder.encode_into(next_cursor, buf, -1)
+    buf += b"}"
+    return bytes(buf)
+
+
+@lru_cache(maxsize=1024)
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp; memoized as the UI resends the same filters."""
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+# The database layer is synchronous. Handlers that only do blocking work are
+# plain ``def`` so FastAPI runs them in its threadpool instead of on the event
+# loop; ``async def`` handlers must wrap blocking calls in run_in_threadpool.
+
+# Reused across requests; msgspec encoders and decoders are thread-safe
+_page_encoder = msgspec.json.Encoder()
+_create_decoder = msgspec.json.Decoder(FeedbackCreateBody)
+# Validates a whole list of ORM rows in one pydantic-core call
+_feedback_list_adapter = TypeAdapter(list[FeedbackResponse])
+
 
 @router.get("/feedback", response_model=FeedbackListResponse, tags=["Feedback"])
-async def get_feedback(
+def get_feedback(
     page: int = Query(DEFAULT_PAGE, ge=1, description="Page number"),
     page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Items per page"),
     search: Optional[str] = Query(None, description="Search text in feedback content"),
@@ -29,21 +99,35 @@ async def get_feedback(
     sentiment: Optional[str] = Query(None, description="Filter by sentiment"),
     start_date: Optional[str] = Query(None, description="Start date (ISO format)"),
     end_date: Optional[str] = Query(None, description="End date (ISO format)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces page-based offsets"),
     db: Session = Depends(get_db)
 ):
     """
     Get paginated feedback with optional filters.
     
-    Returns a list of feedback items with pagination support.
+    Returns a list of feedback items with pagination support. Passing the
+    previous response's next_cursor fetches the following page with an index
+    range scan instead of skipping rows with OFFSET; the total is still a
+    separate COUNT over all matching rows.
     """
     skip = (page - 1) * page_size
+    after = None
+    if cursor:
+        try:
+            after = _decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            ) from e
+        skip = 0
     
     # Parse date strings
     start_dt = None
     end_dt = None
     if start_date:
         try:
-            start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+            start_dt = _parse_iso(start_date)
         except ValueError as e:
             logger.warning(f"Invalid start_date format: {start_date}")
             raise HTTPException(
@@ -53,7 +137,7 @@ async def get_feedback(
     
     if end_date:
         try:
-            end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+            end_dt = _parse_iso(end_date)
         except ValueError as e:
             logger.warning(f"Invalid end_date format: {end_date}")
             raise HTTPException(
@@ -70,14 +154,19 @@ async def get_feedback(
             source=source,
             sentiment=sentiment,
             start_date=start_dt,
-            end_date=end_dt
+            end_date=end_dt,
+            after=after
         )
         
-        return FeedbackListResponse(
-            items=[FeedbackResponse.model_validate(f) for f in feedback],
-            total=total,
-            page=page,
-            page_size=page_size
+        next_cursor = None
+        if len(feedback) == page_size:
+            next_cursor = _encode_cursor(feedback[-1].created_at, feedback[-1].id)
+        
+        # Encode straight from the result rows; FeedbackListResponse is only
+        # used to document the response schema.
+        return Response(
+            content=_encode_page(feedback, total, page, page_size, next_cursor),
+            media_type="application/json"
         )
     except Exception as e:
         logger.error(f"Error fetching feedback: {str(e)}", exc_info=True)
@@ -88,7 +177,7 @@ async def get_feedback(
 
 
 @router.get("/feedback/stats", response_model=StatsResponse, tags=["Statistics"])
-async def get_stats(db: Session = Depends(get_db)):
+def get_stats(db: Session = Depends(get_db)):
     """
     Get feedback statistics.
     
@@ -107,50 +196,138 @@ async def get_stats(db: Session = Depends(get_db)):
 
 
 @router.get("/feedback/{feedback_id}", response_model=FeedbackResponse, tags=["Feedback"])
-async def get_feedback_by_id(feedback_id: int, db: Session = Depends(get_db)):
+def get_feedback_by_id(feedback_id: int, db: Session = Depends(get_db)):
     """
     Get a single feedback item by ID.
     
     Args:
         feedback_id: The ID of the feedback item to retrieve
     """
-    from ..models import Feedback
-    
-    feedback = db.query(Feedback).filter(Feedback.id == feedback_id).first()
+    feedback = db.get(Feedback, feedback_id)
     if not feedback:
         raise FeedbackNotFoundError(f"Feedback with ID {feedback_id} not found")
     
     return FeedbackResponse.model_validate(feedback)
 
 
-@router.post("/feedback", response_model=FeedbackResponse, status_code=status.HTTP_201_CREATED, tags=["Feedback"])
-async def create_feedback(feedback: FeedbackCreate, db: Session = Depends(get_db)):
+@router.post(
+    "/feedback",
+    response_model=FeedbackResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["Feedback"],
+    # The body is decoded with msgspec below, so document it explicitly
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": FeedbackCreate.model_json_schema()}},
+        }
+    },
+)
+async def create_feedback(request: Request, db: Session = Depends(get_db)):
     """
     Create new feedback. Sentiment will be automatically analyzed using AI.
     
-    Args:
-        feedback: Feedback data including text, source, and optional metadata
+    The request body contains feedback text, source, and optional metadata.
+    The item is returned as soon as it is stored, with a null sentiment;
+    a background worker fills it in shortly after, visible through
+    GET /feedback/{feedback_id}.
     """
     try:
-        created = FeedbackService.create_feedback(
+        feedback = _create_decoder.decode(await request.body())
+    except msgspec.DecodeError as e:
+        raise RequestValidationError(
+            [{"type": "value_error", "loc": ("body",), "msg": str(e), "input": None}]
+        ) from e
+    metadata = feedback.metadata if feedback.metadata is not None else feedback.extra_data
+    
+    try:
+        FeedbackService.validate_feedback(feedback.text, feedback.source)
+    except ValueError as e:
+        # Bad client input, not a server failure
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        ) from e
+    
+    try:
+        # Store the item unlabelled and hand it to the sentiment worker, which
+        # batches it with other new items into one AI request.
+        created = await run_in_threadpool(
+            FeedbackService.create_feedback,
             db=db,
             text=feedback.text,
             source=feedback.source,
-            metadata=feedback.metadata
+            metadata=metadata
         )
-        logger.info(f"Created feedback with ID {created.id}")
+        sentiment_worker.enqueue(created.id, created.text)
+        logger.info("Created feedback with ID %s", created.id)
         return FeedbackResponse.model_validate(created)
+    except Exception as e:
+        logger.error(f"Error creating feedback: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create feedback"
+        ) from e
+
+
+@router.post("/feedback/bulk", response_model=list[FeedbackResponse], status_code=status.HTTP_201_CREATED, tags=["Feedback"])
+async def create_feedback_bulk(request: FeedbackBulkCreate, db: Session = Depends(get_db)):
+    """
+    Create many feedback items at once. Sentiment is analyzed in batched AI requests.
+    
+    Args:
+        request: Feedback items including text, source, and optional metadata
+    """
+    try:
+        for item in request.items:
+            FeedbackService.validate_feedback(item.text, item.source)
+    except ValueError as e:
+        # Bad client input, not a server failure
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        ) from e
+    
+    try:
+        sentiments = await ai_service.aanalyze_sentiment_batch([item.text for item in request.items])
+        created = await run_in_threadpool(
+            FeedbackService.create_feedback_bulk,
+            db=db,
+            items=[item.model_dump() for item in request.items],
+            sentiments=sentiments
+        )
+        logger.info("Created %d feedback items in bulk", len(created))
+        return _feedback_list_adapter.validate_python(created, from_attributes=True)
     except AIServiceError as e:
-        logger.error(f"AI service error while creating feedback: {str(e)}")
+        logger.error(f"AI service error while creating feedback in bulk: {str(e)}")
         raise
     except Exception as e:
-        logger.error(f"Error creating feedback: {str(e)}", exc_info=True)
+        logger.error(f"Error creating feedback in bulk: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create feedback"
         ) from e
 
 
+@router.post("/feedback/reanalyze", response_model=list[FeedbackResponse], tags=["AI"])
+def reanalyze_feedback(request: FeedbackReanalyze, db: Session = Depends(get_db)):
+    """
+    Re-run sentiment analysis for the given feedback items.
+    
+    Args:
+        request: IDs of the feedback items to re-analyze; unknown IDs are ignored
+    """
+    try:
+        updated = FeedbackService.reanalyze_bulk(db, request.feedback_ids)
+        return _feedback_list_adapter.validate_python(updated, from_attributes=True)
+    except Exception as e:
+        logger.error(f"Error re-analyzing feedback: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to re-analyze feedback"
+        ) from e
+
+
 @router.post("/feedback/summarize", response_model=SummarizeResponse, tags=["AI"])
 async def summarize_feedback(request: SummarizeRequest, db: Session = Depends(get_db)):
     """
@@ -159,11 +336,15 @@ async def summarize_feedback(request: SummarizeRequest, db: Session = Depends(ge
     Can summarize specific feedback by IDs or filtered feedback based on criteria.
     """
     feedback_items = []
+    # Filters for the SQL sentiment breakdown; stays None when summarizing by IDs
+    count_filters = None
     
     try:
         if request.feedback_ids:
             # Summarize specific feedback items
-            feedback_items = FeedbackService.get_feedback_by_ids(db, request.feedback_ids)
+            feedback_items = await run_in_threadpool(
+                FeedbackService.get_feedback_by_ids, db, request.feedback_ids
+            )
             if not feedback_items:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -177,7 +358,7 @@ async def summarize_feedback(request: SummarizeRequest, db: Session = Depends(ge
             
             if filters.get('start_date'):
                 try:
-                    start_dt = datetime.fromisoformat(filters['start_date'].replace('Z', '+00:00'))
+                    start_dt = _parse_iso(filters['start_date'])
                 except ValueError:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
@@ -185,26 +366,33 @@ async def summarize_feedback(request: SummarizeRequest, db: Session = Depends(ge
                     )
             if filters.get('end_date'):
                 try:
-                    end_dt = datetime.fromisoformat(filters['end_date'].replace('Z', '+00:00'))
+                    end_dt = _parse_iso(filters['end_date'])
                 except ValueError:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
                         detail="Invalid end_date format in filters"
                     )
             
-            feedback_items, _ = FeedbackService.get_feedback(
+            count_filters = {
+                'search': filters.get('search'),
+                'source': filters.get('source'),
+                'sentiment': filters.get('sentiment'),
+                'start_date': start_dt,
+                'end_date': end_dt,
+            }
+            feedback_items, _ = await run_in_threadpool(
+                FeedbackService.get_feedback,
                 db=db,
                 skip=0,
                 limit=MAX_FEEDBACK_FOR_SUMMARY,
-                search=filters.get('search'),
-                source=filters.get('source'),
-                sentiment=filters.get('sentiment'),
-                start_date=start_dt,
-                end_date=end_dt
+                **count_filters
             )
         else:
             # Get recent feedback if no filters
-            feedback_items, _ = FeedbackService.get_feedback(db=db, skip=0, limit=MAX_FEEDBACK_FOR_SUMMARY)
+            count_filters = {}
+            feedback_items, _ = await run_in_threadpool(
+                FeedbackService.get_feedback, db=db, skip=0, limit=MAX_FEEDBACK_FOR_SUMMARY
+            )
         
         if not feedback_items:
             raise HTTPException(
@@ -217,13 +405,31 @@ async def summarize_feedback(request: SummarizeRequest, db: Session = Depends(ge
         
         # Generate summary
         context = request.filters or {}
-        summary = ai_service.summarize_feedback(feedback_texts, context=context)
+        summary_call = run_in_threadpool(ai_service.summarize_feedback, feedback_texts, context=context)
         
-        # Calculate sentiment breakdown
-        sentiment_breakdown = {}
-        for item in feedback_items:
-            sentiment = item.sentiment or 'unknown'
-            sentiment_breakdown[sentiment] = sentiment_breakdown.get(sentiment, 0) + 1
+        if count_filters is None:
+            summary = await summary_call
+            
+            # Calculate sentiment breakdown
+            sentiment_breakdown = dict(Counter(item.sentiment or 'unknown' for item in feedback_items))
+        else:
+            # The summary call never touches the session, so the grouped
+            # count can use it while Gemini is generating. Both results are
+            # awaited before raising, so the count is finished before
+            # get_db closes the session.
+            summary, sentiment_breakdown = await asyncio.gather(
+                summary_call,
+                run_in_threadpool(
+                    FeedbackService.get_sentiment_counts,
+                    db=db,
+                    limit=MAX_FEEDBACK_FOR_SUMMARY,
+                    **count_filters
+                ),
+                return_exceptions=True
+            )
+            for result in (summary, sentiment_breakdown):
+                if isinstance(result, BaseException):
+                    raise result
         
         logger.info(f"Generated summary for {len(feedback_items)} feedback items")
         return SummarizeResponse(
@@ -1,7 +1,8 @@
 """Application configuration."""
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import ClassVar
+from typing import ClassVar, Literal, Optional
+from functools import cached_property
 from pathlib import Path
 import json
 
@@ -33,6 +34,12 @@ class Settings(BaseSettings):
         min_length=1
     )
     
+    # Redis (optional) - caches AI results when set
+    redis_url: Optional[str] = Field(
+        default=None,
+        description="Redis connection URL; caching is disabled when unset"
+    )
+    
     # CORS - can be comma-separated string or JSON array
     cors_origins: str = Field(
         default="http://localhost:5173,http://localhost:3000",
@@ -47,9 +54,9 @@ class Settings(BaseSettings):
             raise ValueError("Database URL must start with postgresql://")
         return v
     
-    @property
+    @cached_property
     def cors_origins_list(self) -> list[str]:
-        """Parse CORS origins from string to list."""
+        """Parse CORS origins from string to list (parsed once, then cached)."""
         if not self.cors_origins:
             return []
         # Try JSON first, then fall back to comma-separated
@@ -65,9 +72,21 @@ class Settings(BaseSettings):
     debug: bool = Field(default=False, description="Enable debug mode")
     api_prefix: str = Field(default="/api", description="API route prefix")
     
+    # Search: "fulltext" matches words (stemmed), "substring" keeps ILIKE
+    # '%term%' semantics; each is backed by its own GIN index
+    search_mode: Literal["fulltext", "substring"] = Field(
+        default="fulltext",
+        description="How the feedback search filter matches text"
+    )
+    
     # Performance settings
-    database_pool_size: int = Field(default=5, ge=1, le=20, description="Database connection pool size")
+    database_pool_size: int = Field(default=20, ge=1, le=100, description="Database connection pool size")
     database_max_overflow: int = Field(default=10, ge=0, description="Database max overflow connections")
+    database_pool_timeout: int = Field(default=30, ge=1, description="Seconds to wait for a pooled connection")
+    database_disable_jit: bool = Field(
+        default=True,
+        description="Turn off PostgreSQL JIT compilation for API connections"
+    )
 
 
 settings = Settings()
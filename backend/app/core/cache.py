@@ -0,0 +1,88 @@
+"""Redis-backed result cache."""
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional
+
+import msgspec
+import redis
+import redis.asyncio as aioredis
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def make_key(prefix: str, payload: Any) -> str:
+    """Build a cache key from a hash of the JSON-encoded payload."""
+    digest = hashlib.sha256(msgspec.json.encode(payload, order="deterministic")).hexdigest()
+    return f"{prefix}:{digest}"
+
+
+class Cache:
+    """
+    Thin JSON cache over Redis.
+
+    Every operation is a no-op when no Redis URL is configured, and Redis
+    errors are logged rather than raised so an unavailable cache never fails
+    a request.
+    """
+
+    def __init__(self, url: Optional[str]):
+        self._client = redis.Redis.from_url(url, socket_timeout=1) if url else None
+        self._async_client = aioredis.Redis.from_url(url, socket_timeout=1) if url else None
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        if self._client is None:
+            return None
+        try:
+            raw = self._client.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Cache get failed for {key}: {str(e)}")
+            return None
+        return msgspec.json.decode(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        """Store value under key for ttl seconds."""
+        if self._client is None:
+            return
+        try:
+            self._client.set(key, msgspec.json.encode(value), ex=ttl)
+        except redis.RedisError as e:
+            logger.warning(f"Cache set failed for {key}: {str(e)}")
+
+    def delete(self, key: str) -> None:
+        """Drop key so the next read recomputes it."""
+        if self._client is None:
+            return
+        try:
+            self._client.delete(key)
+        except redis.RedisError as e:
+            logger.warning(f"Cache delete failed for {key}: {str(e)}")
+
+    async def aget_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Return the cached value for each key, None for misses, in one MGET."""
+        if self._async_client is None or not keys:
+            return [None] * len(keys)
+        try:
+            raws = await self._async_client.mget(keys)
+        except redis.RedisError as e:
+            logger.warning(f"Cache get failed for {len(keys)} keys: {str(e)}")
+            return [None] * len(keys)
+        return [msgspec.json.decode(raw) if raw is not None else None for raw in raws]
+
+    async def aset_many(self, values: Dict[str, Any], ttl: int) -> None:
+        """Store every key/value pair for ttl seconds in one pipelined round trip."""
+        if self._async_client is None or not values:
+            return
+        try:
+            async with self._async_client.pipeline(transaction=False) as pipe:
+                for key, value in values.items():
+                    pipe.set(key, msgspec.json.encode(value), ex=ttl)
+                await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Cache set failed for {len(values)} keys: {str(e)}")
+
+
+# Singleton instance
+cache = Cache(settings.redis_url)
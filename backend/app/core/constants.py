@@ -4,13 +4,13 @@
 SENTIMENT_POSITIVE = "positive"
 SENTIMENT_NEGATIVE = "negative"
 SENTIMENT_NEUTRAL = "neutral"
-VALID_SENTIMENTS = {SENTIMENT_POSITIVE, SENTIMENT_NEGATIVE, SENTIMENT_NEUTRAL}
+VALID_SENTIMENTS = frozenset({SENTIMENT_POSITIVE, SENTIMENT_NEGATIVE, SENTIMENT_NEUTRAL})
 
 # Feedback sources
 SOURCE_SUPPORT_TICKET = "support_ticket"
 SOURCE_SURVEY = "survey"
 SOURCE_APP_STORE = "app_store"
-VALID_SOURCES = {SOURCE_SUPPORT_TICKET, SOURCE_SURVEY, SOURCE_APP_STORE}
+VALID_SOURCES = frozenset({SOURCE_SUPPORT_TICKET, SOURCE_SURVEY, SOURCE_APP_STORE})
 
 # Pagination defaults
 DEFAULT_PAGE = 1
@@ -20,6 +20,21 @@ MAX_PAGE_SIZE = 100
 # AI limits
 MAX_FEEDBACK_FOR_SUMMARY = 50
 MAX_FEEDBACK_FOR_BATCH = 100
+SENTIMENT_BATCH_SIZE = 25  # Texts classified per Gemini request
+SENTIMENT_BATCH_CONCURRENCY = 8  # Gemini requests in flight per async batch call
+AI_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Background sentiment worker
+SENTIMENT_WORKER_BATCH_SIZE = 2 * SENTIMENT_BATCH_SIZE  # A multiple, so full batches split into full Gemini requests
+SENTIMENT_WORKER_MAX_WAIT_SECONDS = 0.05  # How long a batch waits to fill up
+SENTIMENT_SWEEP_INTERVAL_SECONDS = 300  # How often unlabelled rows are requeued
+SENTIMENT_SWEEP_MIN_AGE_SECONDS = 60  # Skip rows another worker may still have queued
+SENTIMENT_SWEEP_LIMIT = 1000  # Rows requeued per sweep
+SENTIMENT_SWEEP_CLAIM_SECONDS = 600  # How long a swept row stays claimed by one process
+
+# Stats cache
+STATS_CACHE_KEY = "feedback:stats"
+STATS_CACHE_TTL_SECONDS = 30  # Bounds staleness if an invalidation is missed
 
 # Date formats
 ISO_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
@@ -1,30 +1,55 @@
 """Logging configuration."""
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 
-def setup_logging(debug: bool = False) -> None:
-    """Configure application logging."""
+def setup_logging(debug: bool = False) -> QueueListener:
+    """
+    Configure application logging.
+    
+    Records are put on an in-memory queue and written to stdout and the log
+    file by a background thread, so logging from async code never blocks the
+    event loop on I/O.
+    
+    Returns:
+        The started listener; stop it on shutdown to flush pending records
+    """
     log_level = logging.DEBUG if debug else logging.INFO
     
     # Create logs directory if it doesn't exist
     log_dir = Path(__file__).parent.parent.parent / "logs"
     log_dir.mkdir(exist_ok=True)
     
-    # Configure root logger
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S',
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler(log_dir / "app.log", encoding="utf-8")
-        ]
+    formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
     )
+    handlers = [
+        logging.StreamHandler(sys.stdout),
+        logging.FileHandler(log_dir / "app.log", encoding="utf-8")
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    
+    # QueueHandler pre-formats records before queueing them; keep that to the
+    # bare message (plus any traceback) so the listener's formatter applies once
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    
+    # Configure root logger
+    logging.basicConfig(level=log_level, handlers=[queue_handler])
     
     # Set specific loggers
     logging.getLogger("uvicorn").setLevel(logging.INFO)
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+    
+    return listener
 
@@ -3,12 +3,24 @@ from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
+from typing import Any, Iterator
 import logging
+import msgspec
 
 from .config import settings
 
 logger = logging.getLogger(__name__)
 
+
+def _json_serializer(value: Any) -> str:
+    # SQLAlchemy expects a str from json_serializer
+    return msgspec.json.encode(value).decode()
+
+
+# JIT compilation costs more than it saves on short OLTP queries. It is set as
+# a connection startup option, which PgBouncer rejects unless configured to.
+connect_args = {"options": "-c jit=off"} if settings.database_disable_jit else {}
+
 # Create engine with connection pooling
 engine = create_engine(
     settings.database_url,
@@ -16,8 +28,13 @@ engine = create_engine(
     poolclass=QueuePool,
     pool_size=settings.database_pool_size,
     max_overflow=settings.database_max_overflow,
+    pool_timeout=settings.database_pool_timeout,
     pool_pre_ping=True,  # Verify connections before using
     pool_recycle=3600,   # Recycle connections after 1 hour
+    pool_use_lifo=True,  # Reuse the most recent connection so idle ones can be recycled
+    json_serializer=_json_serializer,
+    json_deserializer=msgspec.json.decode,
+    connect_args=connect_args,
 )
 
 SessionLocal = sessionmaker(
@@ -37,7 +54,7 @@ def set_sqlite_pragma(dbapi_conn, connection_record):
     pass
 
 
-def get_db() -> Session:
+def get_db() -> Iterator[Session]:
     """
     Dependency for getting database session.
     
@@ -19,6 +19,7 @@ from .core.errors import (
 from .core.exceptions import FeedbackNotFoundError, AIServiceError, DatabaseError
 from .api.routes import router
 from .database import engine, Base
+from .services.sentiment_worker import sentiment_worker
 from sqlalchemy.exc import SQLAlchemyError
 
 
@@ -26,18 +27,26 @@ from sqlalchemy.exc import SQLAlchemyError
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
-    setup_logging(debug=settings.debug)
+    log_listener = setup_logging(debug=settings.debug)
     logger = __import__("logging").getLogger(__name__)
     logger.info(f"Starting {settings.app_name} v{settings.app_version}")
     
-    # Create database tables
-    Base.metadata.create_all(bind=engine)
-    logger.info("Database tables initialized")
+    # Create database tables in development only; otherwise every worker
+    # would pay for the catalog checks on each start. seed_data.py creates
+    # the schema for fresh databases.
+    if settings.debug:
+        Base.metadata.create_all(bind=engine)
+        logger.info("Database tables initialized")
+    
+    sentiment_worker.start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down application")
+    # Label everything still queued before the process exits
+    await sentiment_worker.stop()
+    log_listener.stop()
 
 
 app = FastAPI(
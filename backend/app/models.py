@@ -1,23 +1,78 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON, Index, Text
+from sqlalchemy import Column, DDL, Integer, String, DateTime, JSON, Index, Text, event, literal_column
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
+from .config import settings
 from .database import Base
 
+# Text search configuration shared by the full-text index and search queries;
+# both must use the same expression for PostgreSQL to pick the index.
+FTS_CONFIG = literal_column("'english'")
+
+
+def _search_mode_is(mode: str):
+    """ddl_if callable creating a search index only for the configured SEARCH_MODE."""
+    def check(ddl, target, bind, **kw) -> bool:
+        return settings.search_mode == mode
+    return check
+
 
 class Feedback(Base):
     """Feedback model for storing user feedback."""
     
     __tablename__ = "feedback"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     text = Column(Text, nullable=False)
     source = Column(String(50), nullable=False, index=True)  # support_ticket, survey, app_store
-    sentiment = Column(String(20), nullable=True, index=True)  # positive, negative, neutral
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
-    extra_data = Column(JSON, nullable=True)  # Additional structured data (metadata is reserved in SQLAlchemy)
+    sentiment = Column(String(20), nullable=True)  # positive, negative, neutral
+    # When a sentiment sweep last claimed this row for analysis
+    sentiment_claimed_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Additional structured data (metadata is reserved in SQLAlchemy). JSONB on
+    # PostgreSQL is stored parsed and can be indexed for containment queries.
+    extra_data = Column(JSON().with_variant(JSONB(), 'postgresql'), nullable=True)
     
     __table_args__ = (
-        Index('idx_created_at', 'created_at'),
-        Index('idx_sentiment', 'sentiment'),
-        Index('idx_source', 'source'),
+        # Matches the list ORDER BY so pages are index range scans; also
+        # serves created_at range filters
+        Index('ix_feedback_created_at_desc', created_at.desc(), id.desc()),
+        # Covers every column get_stats reads, so its GROUPING SETS query is
+        # an index-only scan; also serves sentiment filters
+        Index(
+            'ix_feedback_stats',
+            sentiment,
+            source,
+            postgresql_include=['created_at']
+        ),
+        # Serves full-text search when SEARCH_MODE=fulltext
+        Index(
+            'ix_feedback_text_fts',
+            func.to_tsvector(FTS_CONFIG, text),
+            postgresql_using='gin'
+        ).ddl_if(dialect='postgresql', callable_=_search_mode_is('fulltext')),
+        # Serves extra_data @> '{...}' containment filters
+        Index(
+            'ix_feedback_extra_data',
+            extra_data,
+            postgresql_using='gin',
+            postgresql_ops={'extra_data': 'jsonb_path_ops'}
+        ).ddl_if(dialect='postgresql'),
+        # Serves ILIKE '%term%' when SEARCH_MODE=substring
+        Index(
+            'ix_feedback_text_trgm',
+            text,
+            postgresql_using='gin',
+            postgresql_ops={'text': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql', callable_=_search_mode_is('substring')),
+    )
+
+
+# gin_trgm_ops comes from the pg_trgm extension
+event.listen(
+    Feedback.__table__,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(
+        dialect='postgresql', callable_=_search_mode_is('substring')
     )
+)
 
@@ -1,6 +1,9 @@
 from pydantic import BaseModel, Field, field_serializer
 from datetime import datetime
 from typing import Optional, Dict, Any
+import msgspec
+
+from .core.constants import MAX_FEEDBACK_FOR_BATCH
 
 
 class FeedbackBase(BaseModel):
@@ -17,6 +20,22 @@ class FeedbackCreate(FeedbackBase):
     pass
 
 
+class FeedbackCreateBody(msgspec.Struct):
+    """msgspec decoder target for POST /feedback; FeedbackCreate documents it."""
+    text: str
+    source: str
+    metadata: Optional[Dict[str, Any]] = None
+    extra_data: Optional[Dict[str, Any]] = None  # Alias accepted by FeedbackCreate
+
+
+class FeedbackBulkCreate(BaseModel):
+    items: list[FeedbackCreate] = Field(..., min_length=1, max_length=MAX_FEEDBACK_FOR_BATCH)
+
+
+class FeedbackReanalyze(BaseModel):
+    feedback_ids: list[int] = Field(..., min_length=1, max_length=MAX_FEEDBACK_FOR_BATCH)
+
+
 class FeedbackResponse(FeedbackBase):
     id: int
     sentiment: Optional[str] = None
@@ -31,6 +50,19 @@ class FeedbackListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to fetch the next page
+
+
+# msgspec mirror of FeedbackResponse, used to encode the paginated feedback
+# endpoint without building a Pydantic model per row. The Pydantic classes
+# above remain the source of truth for the OpenAPI schema.
+class FeedbackItem(msgspec.Struct):
+    id: int
+    text: str
+    source: str
+    created_at: datetime
+    sentiment: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
 
 
 class SummarizeRequest(BaseModel):
@@ -1,11 +1,19 @@
 """AI service for sentiment analysis and summarization using Google Gemini."""
 import google.generativeai as genai
 from typing import List, Dict, Any, Optional
+import asyncio
+import io
+import json
 import logging
+import re
 
 from ..config import settings
+from ..core.cache import cache, make_key
 from ..core.exceptions import AIServiceError
-from ..core.constants import VALID_SENTIMENTS, MAX_FEEDBACK_FOR_SUMMARY
+from ..core.constants import (
+    VALID_SENTIMENTS, MAX_FEEDBACK_FOR_SUMMARY, SENTIMENT_BATCH_SIZE, SENTIMENT_BATCH_CONCURRENCY,
+    AI_CACHE_TTL_SECONDS
+)
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +24,21 @@ except Exception as e:
     logger.error(f"Failed to configure Gemini API: {str(e)}")
     raise
 
+# Keywords for the offline fallback, each compiled into a single
+# case-insensitive alternation so a text is scanned once per polarity. The
+# alternation sits in a lookahead so overlapping keywords ("haterror") are
+# all found, as with a substring test per keyword.
+NEGATIVE_KEYWORDS = ('bad', 'terrible', 'awful', 'hate', 'disappointed', 'frustrated', 'broken', 'bug', 'error', 'crash', 'slow', 'worst')
+POSITIVE_KEYWORDS = ('love', 'great', 'excellent', 'amazing', 'perfect', 'wonderful', 'fantastic', 'best', 'happy', 'satisfied', 'good')
+
+
+def _keyword_pattern(keywords) -> re.Pattern:
+    return re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))", re.IGNORECASE)
+
+
+_NEGATIVE_PATTERN = _keyword_pattern(NEGATIVE_KEYWORDS)
+_POSITIVE_PATTERN = _keyword_pattern(POSITIVE_KEYWORDS)
+
 
 class AIService:
     """Service for interacting with Google Gemini API."""
@@ -41,32 +64,87 @@ class AIService:
             logger.warning("Empty text provided for sentiment analysis, returning neutral")
             return 'neutral'
         
+        prompt = self._sentiment_prompt(text)
+        cache_key = make_key("ai:sentiment", prompt)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            # Limit text length to avoid token limits
-            text_snippet = text[:1000] if len(text) > 1000 else text
-            
-            prompt = f"""Analyze the sentiment of the following customer feedback. 
-            Respond with ONLY one word: 'positive', 'negative', or 'neutral'.
-            
-            Feedback: {text_snippet}
-            
-            Sentiment:"""
-            
             response = self.model.generate_content(prompt)
-            sentiment = response.text.strip().lower().split()[0]  # Get first word only
-            
-            # Validate response
-            if sentiment in VALID_SENTIMENTS:
-                logger.debug(f"AI sentiment analysis: {sentiment}")
-                return sentiment
-            else:
-                logger.warning(f"Invalid sentiment '{sentiment}' from AI, using fallback")
-                return self._fallback_sentiment(text)
-                
+            sentiment = self._parse_sentiment(response.text)
         except Exception as e:
             logger.error(f"Error analyzing sentiment with AI: {str(e)}", exc_info=True)
             # Use fallback instead of raising exception
             return self._fallback_sentiment(text)
+        
+        if sentiment is None:
+            return self._fallback_sentiment(text)
+        cache.set(cache_key, sentiment, AI_CACHE_TTL_SECONDS)
+        return sentiment
+    
+    def analyze_sentiment_batch(self, texts: List[str]) -> List[str]:
+        """
+        Analyze sentiment of many feedback texts with one request per batch.
+        
+        Args:
+            texts: Feedback texts to analyze
+            
+        Returns:
+            One of 'positive', 'negative' or 'neutral' per input text, in order
+        """
+        sentiments: List[str] = []
+        for start in range(0, len(texts), SENTIMENT_BATCH_SIZE):
+            batch = texts[start:start + SENTIMENT_BATCH_SIZE]
+            try:
+                response = self.model.generate_content(self._batch_sentiment_prompt(batch))
+                sentiments.extend(self._parse_sentiment_batch(response.text, batch))
+            except Exception as e:
+                logger.error(f"Error analyzing sentiment batch with AI: {str(e)}", exc_info=True)
+                sentiments.extend(self._fallback_sentiment(text) for text in batch)
+        return sentiments
+    
+    async def aanalyze_sentiment_batch(self, texts: List[str]) -> List[str]:
+        """
+        Async variant of analyze_sentiment_batch.
+        
+        Texts already labelled are served from the same cache entries as
+        analyze_sentiment; only the misses are sent to the model. Batches are
+        sent concurrently, at most SENTIMENT_BATCH_CONCURRENCY at a time, so
+        large inputs are not bound by one request's latency.
+        """
+        keys = [make_key("ai:sentiment", self._sentiment_prompt(text)) for text in texts]
+        labels: List[Optional[str]] = await cache.aget_many(keys)
+        misses = [i for i, label in enumerate(labels) if label is None]
+        semaphore = asyncio.Semaphore(SENTIMENT_BATCH_CONCURRENCY)
+        
+        async def analyze(batch: List[str]) -> List[Optional[str]]:
+            async with semaphore:
+                try:
+                    response = await self.model.generate_content_async(self._batch_sentiment_prompt(batch))
+                    return self._parse_sentiment_labels(response.text, len(batch))
+                except Exception as e:
+                    logger.error(f"Error analyzing sentiment batch with AI: {str(e)}", exc_info=True)
+                    return [None] * len(batch)
+        
+        miss_texts = [texts[i] for i in misses]
+        results = await asyncio.gather(*(
+            analyze(miss_texts[start:start + SENTIMENT_BATCH_SIZE])
+            for start in range(0, len(miss_texts), SENTIMENT_BATCH_SIZE)
+        ))
+        fresh = [label for batch in results for label in batch]
+        
+        # Only real AI labels are cached; fallbacks are recomputed next time
+        await cache.aset_many(
+            {keys[i]: label for i, label in zip(misses, fresh) if label is not None},
+            AI_CACHE_TTL_SECONDS
+        )
+        for i, label in zip(misses, fresh):
+            labels[i] = label
+        return [
+            label if label is not None else self._fallback_sentiment(text)
+            for text, label in zip(texts, labels)
+        ]
     
     def summarize_feedback(self, feedback_texts: List[str], context: Optional[Dict[str, Any]] = None) -> str:
         """
@@ -94,10 +172,18 @@ class AIService:
                     f"Summarizing {MAX_FEEDBACK_FOR_SUMMARY} of {len(feedback_texts)} feedback items"
                 )
             
-            feedback_block = "\n\n---\n\n".join([
-                f"Feedback {i+1}:\n{text}" 
-                for i, text in enumerate(texts_to_summarize)
-            ])
+            # Write every entry into one buffer rather than formatting a
+            # string per entry and joining them
+            buf = io.StringIO()
+            write = buf.write
+            for i, text in enumerate(texts_to_summarize):
+                if i:
+                    write("\n\n---\n\n")
+                write("Feedback ")
+                write(str(i + 1))
+                write(":\n")
+                write(text)
+            feedback_block = buf.getvalue()
             
             context_str = ""
             if context:
@@ -116,22 +202,95 @@ class AIService:
             
             Summary:"""
             
+            # Identical prompts produce equivalent summaries, so reuse them
+            cache_key = make_key("ai:summary", prompt)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Using cached summary of {len(texts_to_summarize)} feedback items")
+                return cached
+            
             response = self.model.generate_content(prompt)
             summary = response.text.strip()
+            cache.set(cache_key, summary, AI_CACHE_TTL_SECONDS)
             logger.info(f"Generated summary of {len(texts_to_summarize)} feedback items")
             return summary
         except Exception as e:
             logger.error(f"Error generating summary: {str(e)}", exc_info=True)
             raise AIServiceError(f"Failed to generate summary: {str(e)}") from e
     
+    @staticmethod
+    def _sentiment_prompt(text: str) -> str:
+        """Build the single-feedback sentiment prompt."""
+        # Limit text length to avoid token limits
+        text_snippet = text[:1000] if len(text) > 1000 else text
+        
+        return f"""Analyze the sentiment of the following customer feedback. 
+            Respond with ONLY one word: 'positive', 'negative', or 'neutral'.
+            
+            Feedback: {text_snippet}
+            
+            Sentiment:"""
+    
+    @staticmethod
+    def _parse_sentiment(response_text: str) -> Optional[str]:
+        """Validate the model's answer; None means the caller should fall back."""
+        sentiment = response_text.strip().lower().split()[0]  # Get first word only
+        
+        if sentiment in VALID_SENTIMENTS:
+            logger.debug(f"AI sentiment analysis: {sentiment}")
+            return sentiment
+        logger.warning(f"Invalid sentiment '{sentiment}' from AI, using fallback")
+        return None
+    
+    @staticmethod
+    def _batch_sentiment_prompt(texts: List[str]) -> str:
+        """Build a prompt classifying every text in one response."""
+        numbered = "\n".join(
+            f"{i+1}) {text[:1000]}" for i, text in enumerate(texts)
+        )
+        return f"""Analyze the sentiment of each of the following {len(texts)} customer feedback entries.
+            Respond with ONLY a JSON array of {len(texts)} strings, one per entry and in the same order,
+            each being 'positive', 'negative', or 'neutral'.
+            
+            Feedback entries:
+            {numbered}
+            
+            Sentiments:"""
+    
+    @staticmethod
+    def _parse_sentiment_labels(response_text: str, count: int) -> List[Optional[str]]:
+        """Parse a JSON label array into count labels, None where a label is bad or missing."""
+        # The model sometimes wraps the array in a markdown code fence
+        start, end = response_text.find("["), response_text.rfind("]")
+        try:
+            labels = json.loads(response_text[start:end + 1]) if start != -1 else []
+        except ValueError:
+            labels = []
+        if not isinstance(labels, list):
+            labels = []
+        if len(labels) != count:
+            logger.warning(f"Got {len(labels)} sentiments for {count} texts from AI, using fallback for the rest")
+        
+        parsed = []
+        for i in range(count):
+            label = labels[i] if i < len(labels) else None
+            label = label.strip().lower() if isinstance(label, str) else None
+            parsed.append(label if label in VALID_SENTIMENTS else None)
+        return parsed
+    
+    def _parse_sentiment_batch(self, response_text: str, texts: List[str]) -> List[str]:
+        """Parse a JSON label array, falling back per entry on bad or missing labels."""
+        labels = self._parse_sentiment_labels(response_text, len(texts))
+        return [
+            label if label is not None else self._fallback_sentiment(text)
+            for text, label in zip(texts, labels)
+        ]
+    
     def _fallback_sentiment(self, text: str) -> str:
         """Fallback sentiment analysis using keyword matching."""
-        text_lower = text.lower()
-        negative_keywords = ['bad', 'terrible', 'awful', 'hate', 'disappointed', 'frustrated', 'broken', 'bug', 'error', 'crash', 'slow', 'worst']
-        positive_keywords = ['love', 'great', 'excellent', 'amazing', 'perfect', 'wonderful', 'fantastic', 'best', 'happy', 'satisfied', 'good']
-        
-        negative_count = sum(1 for keyword in negative_keywords if keyword in text_lower)
-        positive_count = sum(1 for keyword in positive_keywords if keyword in text_lower)
+        # Count distinct keywords present, not occurrences
+        negative_count = len({match.lower() for match in _NEGATIVE_PATTERN.findall(text)})
+        positive_count = len({match.lower() for match in _POSITIVE_PATTERN.findall(text)})
         
         if negative_count > positive_count:
             return 'negative'
@@ -1,17 +1,79 @@
 """Feedback service layer for business logic."""
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import datetime, timedelta
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import Integer, Row, any_, bindparam, case, func, insert, literal, or_, select, tuple_, union_all, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any, List
 import logging
 
-from ..models import Feedback
+from ..config import settings
+from ..models import Feedback, FTS_CONFIG
 from ..core.exceptions import FeedbackNotFoundError, DatabaseError
-from ..core.constants import VALID_SENTIMENTS, VALID_SOURCES
+from ..core.cache import cache
+from ..core.constants import (
+    STATS_CACHE_KEY,
+    STATS_CACHE_TTL_SECONDS,
+    VALID_SENTIMENTS,
+    VALID_SOURCES,
+)
 from .ai_service import ai_service
 
 logger = logging.getLogger(__name__)
 
+# Built once; validate_feedback only adds the offending value
+_VALID_SOURCES_MESSAGE = f"Must be one of {sorted(VALID_SOURCES)}"
+
+# Columns returned by get_feedback, labelled like the API fields. Selecting
+# plain columns yields lightweight Rows instead of hydrated ORM instances.
+_LIST_COLUMNS = (
+    Feedback.id,
+    Feedback.text,
+    Feedback.source,
+    Feedback.created_at,
+    Feedback.sentiment,
+    Feedback.extra_data.label("metadata"),
+)
+
+
+def _filter_conditions(
+    dialect_name: str,
+    search: Optional[str] = None,
+    source: Optional[str] = None,
+    sentiment: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> list:
+    """
+    Build the WHERE clauses shared by the feedback list and aggregate queries.
+    
+    Only filters that are set add a clause, and values are always bound
+    parameters, so each combination of filters maps to one cached compiled
+    statement.
+    
+    On PostgreSQL with SEARCH_MODE=fulltext, search is a full-text match
+    served by the ix_feedback_text_fts GIN index. Otherwise it is a substring
+    ILIKE, which PostgreSQL serves from the ix_feedback_text_trgm index.
+    """
+    conditions = []
+    if search:
+        if dialect_name == 'postgresql' and settings.search_mode == 'fulltext':
+            conditions.append(
+                func.to_tsvector(FTS_CONFIG, Feedback.text)
+                .op('@@')(func.plainto_tsquery(FTS_CONFIG, search))
+            )
+        else:
+            conditions.append(Feedback.text.ilike(f"%{search}%"))
+    if source:
+        conditions.append(Feedback.source == source)
+    if sentiment:
+        conditions.append(Feedback.sentiment == sentiment)
+    if start_date:
+        conditions.append(Feedback.created_at >= start_date)
+    if end_date:
+        conditions.append(Feedback.created_at <= end_date)
+    return conditions
+
 
 class FeedbackService:
     """Service for feedback business logic."""
@@ -25,50 +87,128 @@ class FeedbackService:
         source: Optional[str] = None,
         sentiment: Optional[str] = None,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
-    ) -> tuple[List[Feedback], int]:
-        """Get paginated feedback with filters."""
-        query = db.query(Feedback)
-        
-        # Apply filters
-        if search:
-            query = query.filter(Feedback.text.ilike(f"%{search}%"))
-        
-        if source:
-            query = query.filter(Feedback.source == source)
+        end_date: Optional[datetime] = None,
+        after: Optional[tuple[datetime, int]] = None
+    ) -> tuple[List[Row], int]:
+        """
+        Get paginated feedback with filters.
         
-        if sentiment:
-            query = query.filter(Feedback.sentiment == sentiment)
+        Items are ordered newest first. Passing `after` as the (created_at, id)
+        of the last row already seen continues from there via the
+        ix_feedback_created_at_desc index instead of skipping rows with OFFSET.
         
-        if start_date:
-            query = query.filter(Feedback.created_at >= start_date)
+        Returns:
+            Read-only rows with id, text, source, created_at, sentiment and
+            metadata attributes, and the total number of matching items
+        """
+        conditions = _filter_conditions(
+            db.get_bind().dialect.name, search, source, sentiment, start_date, end_date
+        )
+        stmt = (
+            select(*_LIST_COLUMNS)
+            .order_by(Feedback.created_at.desc(), Feedback.id.desc())
+            .limit(limit)
+        )
         
-        if end_date:
-            query = query.filter(Feedback.created_at <= end_date)
+        if after is not None:
+            # No window count here: it would make PostgreSQL read every row
+            # past the cursor before LIMIT applies, so the index scan could not
+            # stop early. The total comes from a separate COUNT instead.
+            keyset = tuple_(Feedback.created_at, Feedback.id) < after
+            feedback = db.execute(stmt.where(*conditions, keyset)).all()
+            total = db.scalar(select(func.count()).select_from(Feedback).where(*conditions))
+            return feedback, total
         
-        # Get total count
-        total = query.count()
+        # The window count is evaluated before LIMIT/OFFSET, so every row of
+        # the page carries the total and no separate COUNT query is needed.
+        # A page is at most MAX_PAGE_SIZE plain Rows, so fetching it in one go
+        # is cheaper than a server-side cursor with yield_per
+        stmt = stmt.add_columns(func.count().over().label("total")).where(*conditions).offset(skip)
+        feedback = db.execute(stmt).all()
         
-        # Apply pagination and ordering
-        feedback = query.order_by(Feedback.created_at.desc()).offset(skip).limit(limit).all()
+        if feedback:
+            total = feedback[0].total
+        elif skip:
+            # Past the last page there is no row to read the total from
+            total = db.scalar(select(func.count()).select_from(Feedback).where(*conditions))
+        else:
+            total = 0
         
         return feedback, total
     
+    @staticmethod
+    def get_sentiment_counts(
+        db: Session,
+        limit: int,
+        search: Optional[str] = None,
+        source: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Dict[str, int]:
+        """
+        Count sentiments over the newest `limit` items matching the filters.
+        
+        Covers the same rows as get_feedback(skip=0, limit=limit) with the
+        same filters, grouped in the database.
+        """
+        conditions = _filter_conditions(
+            db.get_bind().dialect.name, search, source, sentiment, start_date, end_date
+        )
+        newest = (
+            select(Feedback.sentiment)
+            .where(*conditions)
+            .order_by(Feedback.created_at.desc(), Feedback.id.desc())
+            .limit(limit)
+            .subquery()
+        )
+        label = func.coalesce(newest.c.sentiment, 'unknown')
+        rows = db.execute(select(label, func.count()).group_by(label)).all()
+        return {sent: count for sent, count in rows}
+    
     @staticmethod
     def get_feedback_by_ids(db: Session, feedback_ids: List[int]) -> List[Feedback]:
         """Get feedback items by their IDs."""
         if not feedback_ids:
             return []
+        if db.get_bind().dialect.name == 'postgresql':
+            # A single array parameter keeps the SQL text the same however
+            # many IDs are passed, instead of one placeholder per ID
+            condition = Feedback.id == any_(bindparam('ids', feedback_ids, type_=ARRAY(Integer)))
+        else:
+            condition = Feedback.id.in_(feedback_ids)
         try:
-            return db.query(Feedback).filter(Feedback.id.in_(feedback_ids)).all()
+            return list(db.scalars(select(Feedback).where(condition)))
         except Exception as e:
             logger.error(f"Error fetching feedback by IDs: {str(e)}", exc_info=True)
             raise DatabaseError(f"Failed to fetch feedback by IDs: {str(e)}") from e
     
     @staticmethod
-    def create_feedback(db: Session, text: str, source: str, metadata: Optional[Dict] = None) -> Feedback:
+    def validate_feedback(text: str, source: str) -> None:
         """
-        Create new feedback and analyze sentiment.
+        Validate feedback input before any AI or database work is done.
+        
+        Raises:
+            ValueError: If source is invalid or text is empty
+        """
+        if source not in VALID_SOURCES:
+            raise ValueError(f"Invalid source: {source}. {_VALID_SOURCES_MESSAGE}")
+        
+        if not text or not text.strip():
+            raise ValueError("Feedback text cannot be empty")
+    
+    @staticmethod
+    def create_feedback(
+        db: Session,
+        text: str,
+        source: str,
+        metadata: Optional[Dict] = None
+    ) -> Feedback:
+        """
+        Create new feedback without a sentiment.
+        
+        The sentiment stays NULL until the background sentiment worker labels
+        the item.
         
         Args:
             db: Database session
@@ -83,32 +223,21 @@ class FeedbackService:
             ValueError: If source is invalid
             DatabaseError: If database operation fails
         """
-        if source not in VALID_SOURCES:
-            raise ValueError(f"Invalid source: {source}. Must be one of {VALID_SOURCES}")
-        
-        if not text or not text.strip():
-            raise ValueError("Feedback text cannot be empty")
+        FeedbackService.validate_feedback(text, source)
         
         try:
-            # Analyze sentiment using AI
-            sentiment = ai_service.analyze_sentiment(text)
-            
-            if sentiment not in VALID_SENTIMENTS:
-                logger.warning(f"Invalid sentiment '{sentiment}' returned, using neutral")
-                sentiment = 'neutral'
-            
             feedback = Feedback(
                 text=text.strip(),
                 source=source,
-                sentiment=sentiment,
                 extra_data=metadata
             )
             
             db.add(feedback)
             db.commit()
             db.refresh(feedback)
+            cache.delete(STATS_CACHE_KEY)
             
-            logger.info(f"Created feedback ID {feedback.id} with sentiment {sentiment}")
+            logger.info("Created feedback ID %s", feedback.id)
             return feedback
         except Exception as e:
             db.rollback()
@@ -116,44 +245,245 @@ class FeedbackService:
             raise DatabaseError(f"Failed to create feedback: {str(e)}") from e
     
     @staticmethod
-    def get_stats(db: Session) -> Dict[str, Any]:
-        """Get feedback statistics."""
-        total = db.query(Feedback).count()
-        
-        # Sentiment counts
-        sentiment_counts = (
-            db.query(Feedback.sentiment, func.count(Feedback.id))
-            .group_by(Feedback.sentiment)
-            .all()
+    def create_feedback_bulk(
+        db: Session,
+        items: List[Dict[str, Any]],
+        sentiments: Optional[List[str]] = None
+    ) -> List[Feedback]:
+        """
+        Create many feedback items with a single batched sentiment pass and INSERT.
+        
+        Args:
+            db: Database session
+            items: Dicts with 'text', 'source' and optional 'metadata' keys
+            sentiments: Pre-computed sentiments, one per item; analyzed with AI when omitted
+            
+        Returns:
+            Created Feedback objects, in input order
+            
+        Raises:
+            ValueError: If any item is invalid
+            DatabaseError: If database operation fails
+        """
+        for item in items:
+            FeedbackService.validate_feedback(item['text'], item['source'])
+        
+        if not items:
+            return []
+        
+        try:
+            if sentiments is None:
+                sentiments = ai_service.analyze_sentiment_batch([item['text'] for item in items])
+            
+            rows = [
+                {
+                    'text': item['text'].strip(),
+                    'source': item['source'],
+                    'sentiment': sentiment if sentiment in VALID_SENTIMENTS else 'neutral',
+                    'extra_data': item.get('metadata')
+                }
+                for item, sentiment in zip(items, sentiments)
+            ]
+            # One multi-row INSERT ... RETURNING instead of a flush + refresh per object
+            feedback = db.scalars(insert(Feedback).returning(Feedback, sort_by_parameter_order=True), rows).all()
+            db.commit()
+            cache.delete(STATS_CACHE_KEY)
+            
+            logger.info("Created %d feedback items in bulk", len(feedback))
+            return list(feedback)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error creating feedback in bulk: {str(e)}", exc_info=True)
+            raise DatabaseError(f"Failed to create feedback in bulk: {str(e)}") from e
+    
+    @staticmethod
+    def claim_unlabelled(
+        db: Session,
+        created_before: datetime,
+        claimed_before: datetime,
+        limit: int
+    ) -> List[Row]:
+        """
+        Claim the oldest feedback still waiting for a sentiment label.
+        
+        Rows claimed after claimed_before are left to the process holding the
+        claim, so several processes sweeping at once never return the same row.
+        SKIP LOCKED keeps concurrent claims from waiting on each other.
+        
+        Returns:
+            Rows with id and text attributes
+            
+        Raises:
+            DatabaseError: If database operation fails
+        """
+        claimable = (
+            select(Feedback.id)
+            .where(
+                Feedback.sentiment.is_(None),
+                Feedback.created_at < created_before,
+                or_(
+                    Feedback.sentiment_claimed_at.is_(None),
+                    Feedback.sentiment_claimed_at < claimed_before
+                )
+            )
+            .order_by(Feedback.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
         )
-        sentiment_dict = {sent or 'unknown': count for sent, count in sentiment_counts}
+        try:
+            rows = db.execute(
+                update(Feedback)
+                .where(Feedback.id.in_(claimable.scalar_subquery()))
+                .values(sentiment_claimed_at=func.now())
+                .returning(Feedback.id, Feedback.text)
+                .execution_options(synchronize_session=False)
+            ).all()
+            db.commit()
+            return rows
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error claiming unlabelled feedback: {str(e)}", exc_info=True)
+            raise DatabaseError(f"Failed to claim unlabelled feedback: {str(e)}") from e
+    
+    @staticmethod
+    def update_sentiments(db: Session, sentiments: Dict[int, str]) -> Dict[int, str]:
+        """
+        Set the sentiment of many feedback items with a single UPDATE.
         
-        # Source counts
-        source_counts = (
-            db.query(Feedback.source, func.count(Feedback.id))
-            .group_by(Feedback.source)
-            .all()
+        Args:
+            db: Database session
+            sentiments: Sentiment per feedback ID; invalid labels are stored as neutral
+            
+        Returns:
+            The label stored for each feedback ID
+            
+        Raises:
+            DatabaseError: If database operation fails
+        """
+        if not sentiments:
+            return {}
+        
+        labels = {
+            feedback_id: sentiment if sentiment in VALID_SENTIMENTS else 'neutral'
+            for feedback_id, sentiment in sentiments.items()
+        }
+        try:
+            db.execute(
+                update(Feedback)
+                .where(Feedback.id.in_(labels))
+                .values(sentiment=case(labels, value=Feedback.id))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            cache.delete(STATS_CACHE_KEY)
+            return labels
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error updating sentiments: {str(e)}", exc_info=True)
+            raise DatabaseError(f"Failed to update sentiments: {str(e)}") from e
+    
+    @staticmethod
+    def reanalyze_bulk(db: Session, feedback_ids: List[int]) -> List[Feedback]:
+        """
+        Re-analyze sentiment for many feedback items with batched AI requests
+        and a single UPDATE.
+        
+        Returns:
+            The updated Feedback objects; IDs that do not exist are skipped
+            
+        Raises:
+            DatabaseError: If database operation fails
+        """
+        feedback = FeedbackService.get_feedback_by_ids(db, feedback_ids)
+        if not feedback:
+            return []
+        
+        sentiments = ai_service.analyze_sentiment_batch([f.text for f in feedback])
+        labels = FeedbackService.update_sentiments(
+            db, {f.id: sentiment for f, sentiment in zip(feedback, sentiments)}
         )
-        source_dict = {source: count for source, count in source_counts}
+        # The UPDATE leaves the loaded objects alone; set the stored labels
+        # as committed values so they are neither reloaded nor flushed again
+        for f in feedback:
+            set_committed_value(f, 'sentiment', labels[f.id])
+        
+        logger.info(f"Re-analyzed sentiment for {len(feedback)} feedback items")
+        return feedback
+    
+    @staticmethod
+    def get_stats(db: Session) -> Dict[str, Any]:
+        """
+        Get feedback statistics in a single round trip.
+        
+        Results are cached for STATS_CACHE_TTL_SECONDS and dropped whenever
+        feedback is created or re-analyzed, so dashboard polling rarely
+        reaches the database.
+        """
+        cached = cache.get(STATS_CACHE_KEY)
+        if cached is not None:
+            return cached
+        
+        week_ago = datetime.now(timezone.utc) - timedelta(days=7)
+        recent = func.count().filter(Feedback.created_at >= week_ago)
+        
+        # One row per sentiment and per source, each with its total and
+        # last-7-days count
+        if db.get_bind().dialect.name == 'postgresql':
+            # GROUPING SETS builds both groupings from a single table scan;
+            # GROUPING() tells the sentiment rows (source rolled up) apart
+            # from the source rows even when the sentiment itself is NULL
+            is_sentiment = func.grouping(Feedback.source) == 1
+            stmt = (
+                select(
+                    case((is_sentiment, 'sentiment'), else_='source'),
+                    case((is_sentiment, Feedback.sentiment), else_=Feedback.source),
+                    func.count(),
+                    recent
+                )
+                .group_by(func.grouping_sets(Feedback.sentiment, Feedback.source))
+            )
+        else:
+            by_sentiment = (
+                select(literal('sentiment'), Feedback.sentiment, func.count(), recent)
+                .group_by(Feedback.sentiment)
+            )
+            by_source = (
+                select(literal('source'), Feedback.source, func.count(), recent)
+                .group_by(Feedback.source)
+            )
+            stmt = union_all(by_sentiment, by_source)
+        rows = db.execute(stmt).all()
         
-        # Recent count (last 7 days)
-        week_ago = datetime.utcnow() - timedelta(days=7)
-        recent_count = db.query(Feedback).filter(Feedback.created_at >= week_ago).count()
+        sentiment_dict = {}
+        source_dict = {}
+        total = 0
+        recent_count = 0
+        for kind, key, count, recent_in_group in rows:
+            if kind == 'sentiment':
+                sentiment_dict[key or 'unknown'] = count
+                # Every row has exactly one sentiment group, so these sum to the totals
+                total += count
+                recent_count += recent_in_group
+            else:
+                source_dict[key] = count
         
-        return {
+        stats = {
             'total_feedback': total,
             'sentiment_counts': sentiment_dict,
             'source_counts': source_dict,
             'recent_count': recent_count
         }
+        cache.set(STATS_CACHE_KEY, stats, STATS_CACHE_TTL_SECONDS)
+        return stats
     
     @staticmethod
     def analyze_sentiment_for_feedback(db: Session, feedback_id: int) -> Feedback:
         """Re-analyze sentiment for a specific feedback item."""
-        feedback = db.query(Feedback).filter(Feedback.id == feedback_id).first()
+        feedback = db.get(Feedback, feedback_id)
         if feedback:
             feedback.sentiment = ai_service.analyze_sentiment(feedback.text)
             db.commit()
             db.refresh(feedback)
+            cache.delete(STATS_CACHE_KEY)
         return feedback
 
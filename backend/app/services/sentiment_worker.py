@@ -0,0 +1,145 @@
+"""Background worker that labels new feedback with batched sentiment requests."""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from ..core.constants import (
+    SENTIMENT_SWEEP_CLAIM_SECONDS,
+    SENTIMENT_SWEEP_INTERVAL_SECONDS,
+    SENTIMENT_SWEEP_LIMIT,
+    SENTIMENT_SWEEP_MIN_AGE_SECONDS,
+    SENTIMENT_WORKER_BATCH_SIZE,
+    SENTIMENT_WORKER_MAX_WAIT_SECONDS,
+)
+from ..database import SessionLocal
+from .ai_service import ai_service
+from .feedback_service import FeedbackService
+
+logger = logging.getLogger(__name__)
+
+
+class SentimentWorker:
+    """
+    Collect newly created feedback and analyze it in batches.
+
+    Items queued within SENTIMENT_WORKER_MAX_WAIT_SECONDS of each other, up to
+    SENTIMENT_WORKER_BATCH_SIZE, share one batched AI request and one UPDATE.
+    Until then the feedback is stored with a NULL sentiment.
+
+    The queue lives in memory, so rows can be left unlabelled by a restart or
+    a failed batch. A sweep at startup and every SENTIMENT_SWEEP_INTERVAL_SECONDS
+    requeues rows that are still NULL, so every row is labelled eventually.
+    Each sweep claims its rows in the database first, so with several worker
+    processes a row is requeued by one of them only; a claim that is not
+    labelled within SENTIMENT_SWEEP_CLAIM_SECONDS can be swept again.
+    """
+
+    def __init__(self):
+        self._queue: asyncio.Queue[Tuple[int, str]] = asyncio.Queue()
+        self._pending: Set[int] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._sweep_task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start consuming the queue and sweeping on the running event loop."""
+        self._task = asyncio.create_task(self._run())
+        self._sweep_task = asyncio.create_task(self._sweep_forever())
+
+    async def stop(self) -> None:
+        """Finish every queued item, then stop the worker."""
+        if self._task is None:
+            return
+        await self._cancel(self._sweep_task)
+        await self._queue.join()
+        await self._cancel(self._task)
+        self._task = None
+        self._sweep_task = None
+
+    @staticmethod
+    async def _cancel(task: asyncio.Task) -> None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    def enqueue(self, feedback_id: int, text: str) -> None:
+        """Queue a stored feedback item for sentiment analysis."""
+        if feedback_id in self._pending:
+            return
+        self._pending.add(feedback_id)
+        self._queue.put_nowait((feedback_id, text))
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            try:
+                rows = await run_in_threadpool(self._claim_unlabelled)
+                for row in rows:
+                    self.enqueue(row.id, row.text)
+                if rows:
+                    logger.info("Requeued %d unlabelled feedback items", len(rows))
+            except Exception as e:
+                logger.error(f"Error sweeping unlabelled feedback: {str(e)}", exc_info=True)
+            await asyncio.sleep(SENTIMENT_SWEEP_INTERVAL_SECONDS)
+
+    async def _next_batch(self) -> List[Tuple[int, str]]:
+        """Wait for one item, then take whatever else arrives before the deadline."""
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + SENTIMENT_WORKER_MAX_WAIT_SECONDS
+        while len(batch) < SENTIMENT_WORKER_BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            try:
+                sentiments = await ai_service.aanalyze_sentiment_batch([text for _, text in batch])
+                await run_in_threadpool(
+                    self._store,
+                    {feedback_id: sentiment for (feedback_id, _), sentiment in zip(batch, sentiments)}
+                )
+            except Exception as e:
+                # The rows stay NULL and are picked up by the next sweep
+                logger.error(f"Error labelling {len(batch)} feedback items: {str(e)}", exc_info=True)
+            finally:
+                for feedback_id, _ in batch:
+                    self._pending.discard(feedback_id)
+                    self._queue.task_done()
+
+    @staticmethod
+    def _claim_unlabelled() -> list:
+        # Rows younger than the minimum age may still be queued by the
+        # process that created them
+        now = datetime.now(timezone.utc)
+        created_before = now - timedelta(seconds=SENTIMENT_SWEEP_MIN_AGE_SECONDS)
+        claimed_before = now - timedelta(seconds=SENTIMENT_SWEEP_CLAIM_SECONDS)
+        db = SessionLocal()
+        try:
+            return FeedbackService.claim_unlabelled(
+                db, created_before, claimed_before, SENTIMENT_SWEEP_LIMIT
+            )
+        finally:
+            db.close()
+
+    @staticmethod
+    def _store(sentiments: dict) -> None:
+        db = SessionLocal()
+        try:
+            FeedbackService.update_sentiments(db, sentiments)
+        finally:
+            db.close()
+
+
+# Singleton instance
+sentiment_worker = SentimentWorker()
@@ -1,16 +1,21 @@
 """Script to seed the database with sample feedback data."""
+import argparse
+import asyncio
+import csv
+import io
+import json
 import sys
 from datetime import datetime, timedelta, timezone
 import random
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
 
 # Add parent directory to path
 sys.path.insert(0, '.')
 
-from app.database import Base, get_db
+from app.database import Base, SessionLocal, engine
 from app.models import Feedback
-from app.config import settings
+from app.core.constants import VALID_SENTIMENTS
 
 # Sample feedback data
 SAMPLE_FEEDBACK = [
@@ -137,11 +142,49 @@ SAMPLE_FEEDBACK = [
 ]
 
 
-def seed_database():
-    """Seed the database with sample feedback."""
-    engine = create_engine(settings.database_url)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _copy_rows(db: Session, rows: list[dict]) -> None:
+    """
+    Load rows with PostgreSQL COPY, for seeds too large for INSERT.
     
+    The GIN indexes are dropped for the load and rebuilt afterwards, which is
+    much cheaper than updating them row by row. Only the text search index
+    for the configured SEARCH_MODE is rebuilt.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow((
+            row["text"],
+            row["source"],
+            row["sentiment"],
+            row["created_at"].isoformat(),
+            json.dumps(row["extra_data"]),
+        ))
+    buf.seek(0)
+    
+    gin_indexes = [
+        index for index in Feedback.__table__.indexes
+        if index.dialect_options["postgresql"]["using"] == "gin"
+    ]
+    conn = db.connection()
+    for index in gin_indexes:
+        index.drop(conn, checkfirst=True)
+    conn.connection.cursor().copy_expert(
+        "COPY feedback (text, source, sentiment, created_at, extra_data) FROM STDIN WITH (FORMAT csv)",
+        buf
+    )
+    for index in gin_indexes:
+        index.create(conn)
+
+
+def seed_database(count: int = len(SAMPLE_FEEDBACK), use_copy: bool = False):
+    """
+    Seed the database with sample feedback.
+    
+    Args:
+        count: Number of items to create, cycling through SAMPLE_FEEDBACK
+        use_copy: Load with COPY instead of INSERT (PostgreSQL only)
+    """
     # Create tables
     Base.metadata.create_all(bind=engine)
     
@@ -154,42 +197,56 @@ def seed_database():
             print(f"Database already contains {existing_count} feedback items. Skipping seed.")
             return
         
-    # Generate feedback with varied timestamps (last 30 days)
-    now = datetime.now(timezone.utc)
-        feedback_items = []
-        
-        for i, item in enumerate(SAMPLE_FEEDBACK):
-            # Create feedback with random dates in the last 30 days
-            days_ago = random.randint(0, 30)
-            created_at = now - timedelta(days=days_ago, hours=random.randint(0, 23))
-            
-            feedback = Feedback(
-                text=item["text"],
-                source=item["source"],
-                created_at=created_at,
-                extra_data={"seeded": True}
-            )
-            feedback_items.append(feedback)
-        
-        db.add_all(feedback_items)
-        db.commit()
-        
-        print(f"Successfully seeded {len(feedback_items)} feedback items.")
+        # Generate feedback with varied timestamps (last 30 days)
+        now = datetime.now(timezone.utc)
         
-        # Now analyze sentiment for all items
+        # Analyze sentiment before inserting so every row is written once.
+        # One AI request per SENTIMENT_BATCH_SIZE items, several in flight at
+        # once; failed batches already fall back to keyword analysis
         print("Analyzing sentiment for all feedback items...")
         from app.services.ai_service import ai_service
         
-        for feedback in feedback_items:
-            try:
-                feedback.sentiment = ai_service.analyze_sentiment(feedback.text)
-            except Exception as e:
-                print(f"Error analyzing sentiment for feedback {feedback.id}: {e}")
-                # Use fallback
-                feedback.sentiment = 'neutral'
+        sentiments = asyncio.run(
+            ai_service.aanalyze_sentiment_batch([item["text"] for item in SAMPLE_FEEDBACK])
+        )
+        print("Sentiment analysis complete!")
+        
+        # Offsets for random dates in the last 30 days, drawn in one call:
+        # each is a whole number of hours covering 0-30 days and 0-23 hours
+        hours_ago = random.choices(range(31 * 24), k=count)
         
+        # Larger seeds repeat the samples, so each text is only analyzed once
+        labelled = [
+            (item, sentiment if sentiment in VALID_SENTIMENTS else 'neutral')
+            for item, sentiment in zip(SAMPLE_FEEDBACK, sentiments)
+        ]
+        rows = []
+        for i, offset in enumerate(hours_ago):
+            item, sentiment = labelled[i % len(labelled)]
+            rows.append({
+                "text": item["text"],
+                "source": item["source"],
+                "sentiment": sentiment,
+                "created_at": now - timedelta(hours=offset),
+                "extra_data": {"seeded": True},
+            })
+        
+        if use_copy:
+            _copy_rows(db, rows)
+        else:
+            # A bulk INSERT with a list of parameter sets is sent as multi-row
+            # INSERT statements, skipping the per-object unit of work
+            db.execute(insert(Feedback), rows)
         db.commit()
-        print("Sentiment analysis complete!")
+        
+        print(f"Successfully seeded {len(rows)} feedback items.")
+        
+        if engine.dialect.name == 'postgresql':
+            # Fill in planner statistics and the visibility map right away so
+            # the stats query can use an index-only scan. VACUUM cannot run
+            # inside a transaction.
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                conn.exec_driver_sql("VACUUM (ANALYZE) feedback")
         
     except Exception as e:
         print(f"Error seeding database: {e}")
@@ -200,6 +257,24 @@ def seed_database():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=len(SAMPLE_FEEDBACK),
+        help="number of feedback items to create (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--copy",
+        action="store_true",
+        help="load with PostgreSQL COPY; faster for large --count values"
+    )
+    args = parser.parse_args()
+    if args.count < 1:
+        parser.error("--count must be at least 1")
+    if args.copy and engine.dialect.name != 'postgresql':
+        parser.error("--copy requires PostgreSQL")
+    
     print("Seeding database with sample feedback...")
-    seed_database()
+    seed_database(count=args.count, use_copy=args.copy)
 
@@ -12,6 +12,7 @@ export interface FeedbackListResponse {
   total: number;
   page: number;
   page_size: number;
+  next_cursor?: string | null;
 }
 
 export interface SummarizeRequest {